@@ -1,77 +1,148 @@
 # A. Import the sqlite library
 import sqlite3
+import threading
+import time
+
+# One long-lived connection shared by every request (see getConnection)
+_conn = None
+_lock = threading.Lock()
+
+# Projects only change on POST /contact, so getAllProjects keeps its
+# last page for CACHE_TTL seconds and saveProjectDB adds new rows to it
+CACHE_TTL = 60
+_cache = None
+_cache_key = None
+_cache_ts = 0
+
+# Most projects getAllProjects returns per call, newest first
+PAGE_SIZE = 50
+
+# SQL used on every request. Keeping the same string objects means the
+# connection's statement cache hands back the already compiled statement
+_INSERT_SQL = 'INSERT INTO projects (Title, Description, ImageFileName, Technologies, GitHubLink, DemoLink) values (?,?,?,?,?,?)'
+_SELECT_SQL = 'SELECT Title, Description, ImageFileName, Technologies, GitHubLink, DemoLink FROM projects ORDER BY id DESC LIMIT ? OFFSET ?;'
+
+#######################################################
+# 0. DATABASE CONNECTION
+#######################################################
+#   WAL lets /projects readers keep going while /contact writes, and
+#   NORMAL sync drops the extra fsync per commit. journal_mode is stored
+#   in the database file, the rest has to be set on every connection.
+def _configure(conn):
+    cur = conn.cursor()
+    cur.execute("PRAGMA journal_mode=WAL")
+    cur.execute("PRAGMA synchronous=NORMAL")
+    cur.execute("PRAGMA temp_store=MEMORY")
+    cur.execute("PRAGMA cache_size=-64000")
+    return conn
+
+#   Opening a connection per call repeats the file open, WAL mmap and
+#   page cache warm-up on every request, so keep a single one around.
+#   Callers hold _lock while using it since Flask serves requests on
+#   several threads.
+def getConnection():
+    global _conn
+    with _lock:
+        if _conn is None:
+            _conn = _configure(sqlite3.connect("projects.db", check_same_thread=False, isolation_level=None))
+        return _conn
+
+def closeConnection():
+    global _conn, _cache
+    with _lock:
+        if _conn is not None:
+            _conn.close()
+            _conn = None
+        # The cached rows came from this connection's database
+        _cache = None
 
 #######################################################
 # 1. ADD PROJECT TO DB
 #######################################################
+#   Inserts the row on the shared connection and raises the sqlite3
+#   error if the database rejects it, so callers only report success
+#   for saved projects.
 def saveProjectDB(Title, Description, ImageFileName, Technologies="", GitHubLink="", DemoLink=""):
-    #A. Make a connection to the database
-    conn = None
-    conn = sqlite3.connect("projects.db")
+    global _cache
+    #A. Get the shared connection to the database
+    conn = getConnection()
 
-    #B. Write a SQL statement to insert a specific row (based on Title name)
-    sql = 'INSERT INTO projects (Title, Description, ImageFileName, Technologies, GitHubLink, DemoLink) values (?,?,?,?,?,?)'
+    #B. Build the new project the same way getAllProjects does
+    project = {
+        "Title": Title,
+        "Description": Description,
+        "Image": ImageFileName or "placeholder.png",
+        "Technologies": Technologies or "",
+        "GitHubLink": GitHubLink or "",
+        "DemoLink": DemoLink or ""
+    }
 
-    # B. Create a workspace (aka Cursor)
-    cur = conn.cursor()
+    with _lock:
+        # C. Run the insert statement and pass it parameters for each ?
+        #     The connection is in autocommit mode, so a single INSERT is
+        #     its own transaction and needs no BEGIN/COMMIT round trip
+        conn.execute(_INSERT_SQL, (Title, Description, ImageFileName, Technologies, GitHubLink, DemoLink))
 
-    # C. Run the SQL statement from above and pass it parameters for each ?
-    cur.execute(sql, (Title, Description, ImageFileName, Technologies, GitHubLink, DemoLink))
+        # D. Put it at the top of a warm first page instead of re-reading
+        #     the table; later pages have all shifted, so drop those
+        if _cache is not None:
+            limit, offset = _cache_key
+            _cache = ([project] + _cache)[:limit] if offset == 0 else None
 
-    # D. Save the changes
-    conn.commit()
-    if conn:
-        conn.close()
+    return project
 
 #######################################################
 # 2. SHOW PROJECTS IN A TABLE
 #######################################################
-#   THIS RETURNS AS LIST OF DICTIONARIES
-def getAllProjects():
-    # A. Connection to the database
-    conn = sqlite3.connect('projects.db')
+#   THIS RETURNS AS LIST OF DICTIONARIES, NEWEST FIRST
+#   limit/offset page through the table so each call reads at most
+#   limit rows off the id index no matter how big the table gets
+def getAllProjects(limit=PAGE_SIZE, offset=0):
+    global _cache, _cache_key, _cache_ts
 
-    # B. Create a workspace (aka Cursor)
-    cursorObj = conn.cursor()
-
-    # D. Run the SQL Select statement to retrieve the data
-    cursorObj.execute('SELECT Title, Description, ImageFileName, Technologies, GitHubLink, DemoLink FROM projects;')
-
-    # E. Tell Python to 'fetch' all of the records and put them in
-    #     a list called allRows
-    allRows = cursorObj.fetchall()
-
-    projectListOfDictionaries = []
-
-    for individualRow in allRows:
-        # Make sure we have an image name
-        if individualRow[2] is not None and individualRow[2] != "":
-            Image = individualRow[2]
-        else:
-            Image = "placeholder.png"
-        
-        # Create a dictionary for each row
-        p = {
-            "Title": individualRow[0], 
-            "Description": individualRow[1], 
-            "Image": Image,
-            "Technologies": individualRow[3] if individualRow[3] else "",
-            "GitHubLink": individualRow[4] if individualRow[4] else "",
-            "DemoLink": individualRow[5] if individualRow[5] else ""
-        }
-        projectListOfDictionaries.append(p)
-
-    if conn:
-        conn.close()
-
-    return projectListOfDictionaries
+    # A. Get the shared connection to the database
+    conn = getConnection()
+
+    with _lock:
+        # B. Reuse the last result while it is still fresh
+        if _cache is not None and _cache_key == (limit, offset) and time.monotonic() - _cache_ts < CACHE_TTL:
+            return _cache
+
+        # C. Create a workspace (aka Cursor)
+        cursorObj = conn.cursor()
+
+        # D. Run the SQL Select statement and turn each row into a
+        #     dictionary, using a placeholder when there is no image.
+        #     Rows are read straight off the cursor, so only this one list
+        #     is ever built. It stays a list, not a generator, because it is
+        #     cached and the templates check it with {% if projects %}
+        projectListOfDictionaries = [
+            {
+                "Title": title,
+                "Description": desc,
+                "Image": img or "placeholder.png",
+                "Technologies": tech or "",
+                "GitHubLink": gh or "",
+                "DemoLink": demo or ""
+            }
+            for title, desc, img, tech, gh, demo in cursorObj.execute(_SELECT_SQL, (limit, offset))
+        ]
+
+        # E. Remember the result for the next request
+        _cache = projectListOfDictionaries
+        _cache_key = (limit, offset)
+        _cache_ts = time.monotonic()
+
+        return projectListOfDictionaries
 
 #######################################################
 # 3. CREATE DATABASE AND TABLE
 #######################################################
 def createDatabase():
-    # A. Make a connection to the database
-    conn = sqlite3.connect("projects.db")
+    # A. Make a connection to the database. It runs in autocommit mode,
+    #     so the seed below opens its own transaction
+    conn = sqlite3.connect("projects.db", isolation_level=None)
+    _configure(conn)
     
     # B. Create a workspace (aka Cursor)
     cur = conn.cursor()
@@ -90,37 +161,44 @@ def createDatabase():
         )
     ''')
     
-    # D. Save the changes
-    conn.commit()
+    # D. Insert some sample data the first time the database is set up.
+    #     user_version lives in the file header, so after the first boot
+    #     this is a single pragma read instead of a scan of the table
+    cur.execute('PRAGMA user_version')
+    version = cur.fetchone()[0]
     
-    # E. Insert some sample data if table is empty
-    cur.execute('SELECT COUNT(*) FROM projects')
-    count = cur.fetchone()[0]
+    if version == 0:
+        # Take the write lock before looking, so workers booting at the
+        # same time can't both decide to seed
+        cur.execute('BEGIN IMMEDIATE')
+        try:
+            # Databases made before user_version was used may already have
+            # projects in them, so only seed a table that is really empty
+            cur.execute('SELECT 1 FROM projects LIMIT 1')
+            if cur.fetchone() is None:
+                # Insert sample projects
+                sample_projects = [
+                    ("Golf Score Tracker", 
+                     "Created a score tracker for golf players allowing them to input their scores and compiling them into a database to track and compare with other players.",
+                     "project1.png",
+                     "VBA, VBA Macros",
+                     "https://github.com/Yjan11/personal-website/blob/main/K360-Capstone.xlsm",
+                     "K360-Capstone.xlsm"),
+                    ("Student Management Database", 
+                     "Created a database for managing students, which also includes the projects they manage and documents associated with them. Allows users to also assign teams for projects and enter new students into the system.",
+                     "project2.png",
+                     "HTML, CSS, Python",
+                     "https://github.com/Yjan11/personal-website/blob/main/Front-End%20Prototype%20Project%20Future.html",
+                     "Front-End Prototype Project Future.html")
+                ]
+                
+                # One prepared statement for every sample row
+                cur.executemany(_INSERT_SQL, sample_projects)
+            
+            cur.execute('PRAGMA user_version = 1')
+            cur.execute('COMMIT')
+        except Exception:
+            cur.execute('ROLLBACK')
+            raise
     
-    if count == 0:
-        # Insert sample projects
-        sample_projects = [
-            ("Golf Score Tracker", 
-             "Created a score tracker for golf players allowing them to input their scores and compiling them into a database to track and compare with other players.",
-             "project1.png",
-             "VBA, VBA Macros",
-             "https://github.com/Yjan11/personal-website/blob/main/K360-Capstone.xlsm",
-             "K360-Capstone.xlsm"),
-            ("Student Management Database", 
-             "Created a database for managing students, which also includes the projects they manage and documents associated with them. Allows users to also assign teams for projects and enter new students into the system.",
-             "project2.png",
-             "HTML, CSS, Python",
-             "https://github.com/Yjan11/personal-website/blob/main/Front-End%20Prototype%20Project%20Future.html",
-             "Front-End Prototype Project Future.html")
-        ]
-        
-        for project in sample_projects:
-            cur.execute('''
-                INSERT INTO projects (Title, Description, ImageFileName, Technologies, GitHubLink, DemoLink)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', project)
-    
-    conn.commit()
-    if conn:
-        conn.close()
-
+    conn.close()
@@ -1,37 +1,96 @@
-from flask import Flask, render_template, request, redirect, url_for
+import hashlib
+import sqlite3
+
+from flask import Flask, render_template, request, redirect, url_for, make_response
+from jinja2 import FileSystemBytecodeCache
 
 # Import the DAL functions
-from DAL import *
+from DAL import createDatabase, getAllProjects, saveProjectDB, PAGE_SIZE
 
 app = Flask(__name__)
 
+# Keep compiled templates on disk so a restarted worker doesn't have to
+# parse and compile them again. Jinja picks a private per-user temp dir.
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+
 # Initialize the database when the app starts
 createDatabase()
 
+# How long browsers and proxies may reuse a page before asking again.
+# A visitor who just added a project on /contact should see it on
+# /projects straight away, so the project list is sent with no-cache
+# (0) rather than a max-age. Its revalidation is a 304 from the DAL's
+# cached list without rendering the template, so asking every time is cheap.
+STATIC_MAX_AGE = 3600
+PROJECTS_MAX_AGE = 0
+
+def templates_version():
+    # Hash every template once at startup, so a deploy that changes the
+    # markup also changes the ETags worked out from the data
+    digest = hashlib.sha1()
+    for name in sorted(app.jinja_env.list_templates()):
+        digest.update(name.encode())
+        digest.update(app.jinja_env.loader.get_source(app.jinja_env, name)[0].encode())
+    return digest.hexdigest()
+
+TEMPLATES_VERSION = templates_version()
+
+def cached_page(template, max_age, etag=None, **context):
+    # Send the page with Cache-Control and an ETag, answering a matching
+    # If-None-Match with 304. Without an ETag from the caller it is a
+    # hash of the rendered page; with one, the template is only rendered
+    # when the browser's copy is out of date.
+    if etag is None:
+        resp = make_response(render_template(template, **context))
+        resp.add_etag()
+    else:
+        resp = make_response('')
+        resp.set_etag(etag)
+    
+    resp.cache_control.public = True
+    if max_age:
+        resp.cache_control.max_age = max_age
+    else:
+        resp.cache_control.no_cache = True
+    resp = resp.make_conditional(request)
+    
+    if etag is not None and resp.status_code != 304:
+        resp.set_data(render_template(template, **context))
+    return resp
+
+def page_args():
+    # Read ?limit=&offset= for the project list, never more than one page
+    limit = request.args.get('limit', PAGE_SIZE, type=int)
+    offset = request.args.get('offset', 0, type=int)
+    return min(max(limit, 1), PAGE_SIZE), max(offset, 0)
+
 @app.route('/')
 @app.route('/index')
 def index():
-    return render_template('index.html')
+    return cached_page('index.html', STATIC_MAX_AGE)
 
 @app.route('/about')
 def about():
-    return render_template('about.html')
+    return cached_page('about.html', STATIC_MAX_AGE)
 
 @app.route('/resume')
 def resume():
-    return render_template('resume.html')
+    return cached_page('resume.html', STATIC_MAX_AGE)
 
 @app.route('/projects')
 def projects():
-    # Get all projects from the database
-    projects = getAllProjects()
-    return render_template('projects.html', projects=projects)
+    # Get a page of projects from the database
+    projects = getAllProjects(*page_args())
+    # The ETag follows the project data and the templates, so it changes
+    # after POST /contact and after a deploy
+    etag = hashlib.sha1(repr((TEMPLATES_VERSION, projects)).encode()).hexdigest()
+    return cached_page('projects.html', PROJECTS_MAX_AGE, etag=etag, projects=projects)
 
 @app.route('/contact', methods=['GET', 'POST'])
 def contact():
     if request.method == 'GET':
-        # Get all projects to display current projects
-        projects = getAllProjects()
+        # Get a page of projects to display current projects
+        projects = getAllProjects(*page_args())
         return render_template('contact.html', projects=projects)
     
     elif request.method == 'POST':
@@ -43,20 +102,24 @@ def contact():
         github_link = request.form.get("github_link", "")
         demo_link = request.form.get("demo_link", "")
         
-        # Save the project to database
-        saveProjectDB(title, description, image_filename, technologies, github_link, demo_link)
+        # Save the project to database; only claim success once it is committed
+        try:
+            saveProjectDB(title, description, image_filename, technologies, github_link, demo_link)
+            message = "Project added successfully!"
+        except sqlite3.Error:
+            message = 'Something went wrong.'
         
-        # Get updated projects list
-        projects = getAllProjects()
-        return render_template('contact.html', projects=projects, message="Project added successfully!")
+        # Get the updated page of projects the form was sent from
+        projects = getAllProjects(*page_args())
+        return render_template('contact.html', projects=projects, message=message)
     
     else:
-        projects = getAllProjects()
+        projects = getAllProjects(*page_args())
         return render_template('contact.html', projects=projects, message='Something went wrong.')
 
 @app.route('/thankyou')
 def thankyou():
-    return render_template('thankyou.html')
+    return cached_page('thankyou.html', STATIC_MAX_AGE)
 
 if __name__ == '__main__':
     app.run(debug=True, port=5000, host='0.0.0.0')
\ No newline at end of file
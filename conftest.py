@@ -3,48 +3,101 @@ Pytest configuration and shared fixtures for the Flask website tests.
 """
 
 import pytest
-import tempfile
-import os
 import sqlite3
+import uuid
 from flask import Flask
 from app import app
+import DAL
+
+# The real connect. DAL.sqlite3 is this same module, so once point_dal_at
+# patches it, every sqlite3.connect call goes through the stand-in
+_sqlite_connect = sqlite3.connect
+
+# Rows in the read-only database shared by the tests that only read (see readonly_db)
+_READONLY_PROJECTS = (
+    ("Project A", "Description A", "image_a.png", "Python", "github_a", "demo_a"),
+    ("Project B", "Description B", "image_b.png", "JavaScript", "github_b", "demo_b"),
+    ("Project C", "Description C", "", "Java", "github_c", "demo_c"),  # Empty image
+    ("Project D", "Description D", "image_d.png", None, None, None),  # No optional fields
+)
 
 
 @pytest.fixture(scope="session")
-def test_database():
-    """Create a temporary test database for the entire test session."""
-    # Create a temporary database file
-    test_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
-    test_db.close()
-    
-    # Create the database structure
-    conn = sqlite3.connect(test_db.name)
-    cur = conn.cursor()
+def make_test_database():
+    """Return a function that creates an empty in-memory test database and returns its URI."""
+    keepers = []
     
-    cur.execute('''
-        CREATE TABLE IF NOT EXISTS projects (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            Title TEXT NOT NULL,
-            Description TEXT NOT NULL,
-            ImageFileName TEXT NOT NULL,
-            Technologies TEXT,
-            GitHubLink TEXT,
-            DemoLink TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
+    def make():
+        # Open it through a URI so every connection in this process sees the
+        # same database; connect with uri=True. Memory databases are private
+        # to the process, so pytest-xdist workers never share one
+        uri = "file:testdb_%s?mode=memory&cache=shared" % uuid.uuid4().hex
+        
+        # Create the database structure. This connection stays open for the
+        # session because the database is freed once its last connection closes
+        conn = _sqlite_connect(uri, uri=True)
+        with conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS projects (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    Title TEXT NOT NULL,
+                    Description TEXT NOT NULL,
+                    ImageFileName TEXT NOT NULL,
+                    Technologies TEXT,
+                    GitHubLink TEXT,
+                    DemoLink TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+        keepers.append(conn)
+        return uri
     
-    yield test_db.name
+    yield make
     
     # Cleanup
-    if os.path.exists(test_db.name):
-        os.unlink(test_db.name)
+    for conn in keepers:
+        conn.close()
+
+
+@pytest.fixture(scope="session")
+def test_database(make_test_database):
+    """Create a shared in-memory test database for the entire test session."""
+    return make_test_database()
+
+
+@pytest.fixture(scope="session")
+def test_db_conn(test_database):
+    """Connection for tests that read or write the test database directly."""
+    conn = sqlite3.connect(test_database, uri=True)
+    yield conn
+    conn.close()
 
 
 @pytest.fixture
+def empty_database(test_db_conn):
+    """Empty the test database: no projects, ids counting from 1 and user_version 0."""
+    with test_db_conn:
+        test_db_conn.execute("DELETE FROM projects")
+        test_db_conn.execute("DELETE FROM sqlite_sequence WHERE name='projects'")
+        test_db_conn.execute("PRAGMA user_version = 0")
+    return test_db_conn
+
+
+@pytest.fixture(scope="session")
+def readonly_db(make_test_database):
+    """Second test database, loaded with _READONLY_PROJECTS once for the whole session."""
+    uri = make_test_database()
+    conn = sqlite3.connect(uri, uri=True)
+    with conn:
+        conn.executemany('''
+            INSERT INTO projects (Title, Description, ImageFileName, Technologies, GitHubLink, DemoLink)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', _READONLY_PROJECTS)
+    conn.close()
+    return uri
+
+
+@pytest.fixture(scope="session")
 def flask_app():
     """Create a Flask app instance for testing."""
     app.config['TESTING'] = True
@@ -52,9 +105,9 @@ def flask_app():
     return app
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client(flask_app):
-    """Create a test client for the Flask app."""
+    """Create a test client for the Flask app, shared by the whole session."""
     return flask_app.test_client()
 
 
@@ -103,22 +156,40 @@ def multiple_projects_data():
 
 
 @pytest.fixture(autouse=True)
-def mock_database_connection(test_database):
-    """Mock the database connection to use the test database."""
-    import DAL
-    original_connect = DAL.sqlite3.connect
-    
-    def mock_connect(db_name):
-        if db_name == "projects.db":
-            return sqlite3.connect(test_database)
-        return original_connect(db_name)
-    
-    DAL.sqlite3.connect = mock_connect
+def reset_dal_connection():
+    """Give every test a fresh DAL connection and an empty project cache."""
+    DAL.closeConnection()
     
     yield
     
-    # Restore original connect function
-    DAL.sqlite3.connect = original_connect
+    DAL.closeConnection()
+
+
+@pytest.fixture
+def point_dal_at(monkeypatch):
+    """Return a function that points the DAL's "projects.db" connections at a test database URI."""
+    def point(uri):
+        def connect(database, **kwargs):
+            if database == "projects.db":
+                return _sqlite_connect(uri, uri=True, **kwargs)
+            return _sqlite_connect(database, **kwargs)
+        
+        # monkeypatch puts the real connect back after the test
+        monkeypatch.setattr(DAL.sqlite3, "connect", connect)
+    
+    return point
+
+
+@pytest.fixture
+def mock_database_connection(test_database, point_dal_at):
+    """Mock the database connection to use the test database."""
+    point_dal_at(test_database)
+
+
+@pytest.fixture
+def use_readonly_db(readonly_db, point_dal_at):
+    """Point the DAL at the read-only sample data; tests using it must not write."""
+    point_dal_at(readonly_db)
 
 
 def pytest_configure(config):
@@ -4,6 +4,7 @@ Test runner script for the Flask website.
 This script provides an easy way to run all tests with different configurations.
 """
 
+import shlex
 import subprocess
 import sys
 import os
@@ -51,36 +52,22 @@ def main():
         print("❌ Error: pytest is not installed. Please install it with: pip install -r requirements.txt")
         sys.exit(1)
     
-    # Run different test configurations
-    test_configs = [
-        ("pytest -v", "All tests with verbose output"),
-        ("pytest -v --tb=short", "All tests with short traceback"),
-        ("pytest -v -m unit", "Unit tests only"),
-        ("pytest -v -m integration", "Integration tests only"),
-        ("pytest -v --cov=. --cov-report=term-missing", "All tests with coverage report"),
-        ("pytest -v --cov=. --cov-report=html:htmlcov", "All tests with HTML coverage report"),
-        ("pytest -v -k 'test_database'", "Database tests only"),
-        ("pytest -v -k 'test_projects'", "Project tests only"),
-        ("pytest -v -k 'test_app'", "App tests only"),
-    ]
+    # Run every test once in a single pytest session. Collection and the
+    # session fixtures happen once, and pytest-xdist spreads the tests over
+    # all CPU cores. Extra arguments are passed on, e.g. `-m unit`.
+    command = "pytest -n auto -v --cov=. --cov-report=term-missing --cov-report=html:htmlcov"
+    if len(sys.argv) > 1:
+        command += " " + shlex.join(sys.argv[1:])
     
-    success_count = 0
-    total_count = len(test_configs)
-    
-    for command, description in test_configs:
-        if run_command(command, description):
-            success_count += 1
+    success = run_command(command, "All tests in parallel with coverage report")
     
     # Summary
     print(f"\n{'='*60}")
-    print(f"Test Summary: {success_count}/{total_count} test configurations passed")
-    print('='*60)
-    
-    if success_count == total_count:
-        print("🎉 All test configurations passed!")
+    if success:
+        print("🎉 All tests passed!")
         return 0
     else:
-        print("⚠️  Some test configurations failed. Check the output above for details.")
+        print("⚠️  Some tests failed. Check the output above for details.")
         return 1
 
 
@@ -4,9 +4,8 @@ Tests all endpoints, HTTP methods, and response content.
 """
 
 import pytest
-import tempfile
-import os
 import sqlite3
+from contextlib import closing
 from flask import Flask
 from app import app, createDatabase
 from DAL import saveProjectDB, getAllProjects
@@ -15,103 +14,52 @@ from DAL import saveProjectDB, getAllProjects
 class TestFlaskApp:
     """Test class for Flask application functionality."""
     
-    @pytest.fixture(autouse=True)
-    def setup_and_teardown(self):
-        """Setup and teardown for each test."""
-        # Create a temporary database for testing
-        self.test_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
-        self.test_db.close()
+    @pytest.fixture
+    def mock_database_connection(self, mock_database_connection, test_database):
+        """Mock the database connection to use the shared test database, loaded with test data."""
+        self.test_db = test_database
         
-        # Create test database
-        self.create_test_database()
-        
-        # Configure Flask app for testing
-        app.config['TESTING'] = True
-        app.config['WTF_CSRF_ENABLED'] = False
-        self.client = app.test_client()
-        
-        # Mock the database connection
-        self.mock_database_connection()
-        
-        yield
-        
-        # Cleanup: remove test database file
-        if os.path.exists(self.test_db.name):
-            os.unlink(self.test_db.name)
-    
-    def create_test_database(self):
-        """Create a test database with the same structure as the main database."""
-        conn = sqlite3.connect(self.test_db.name)
-        cur = conn.cursor()
-        
-        cur.execute('''
-            CREATE TABLE IF NOT EXISTS projects (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                Title TEXT NOT NULL,
-                Description TEXT NOT NULL,
-                ImageFileName TEXT NOT NULL,
-                Technologies TEXT,
-                GitHubLink TEXT,
-                DemoLink TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Insert some test data
         test_projects = [
             ("Test Project 1", "Description 1", "project1.png", "Python, Flask", "https://github.com/test1", "https://demo1.test"),
             ("Test Project 2", "Description 2", "project2.png", "JavaScript, React", "https://github.com/test2", "https://demo2.test")
         ]
         
-        for project in test_projects:
-            cur.execute('''
+        # Start from the same two projects in every test; the inner "with conn"
+        # commits both statements together, closing() then closes the connection
+        with closing(sqlite3.connect(self.test_db, uri=True)) as conn, conn:
+            conn.execute("DELETE FROM projects")
+            conn.executemany('''
                 INSERT INTO projects (Title, Description, ImageFileName, Technologies, GitHubLink, DemoLink)
                 VALUES (?, ?, ?, ?, ?, ?)
-            ''', project)
-        
-        conn.commit()
-        conn.close()
+            ''', test_projects)
     
-    def mock_database_connection(self):
-        """Mock the database connection to use test database."""
-        import DAL
-        original_connect = DAL.sqlite3.connect
-        
-        def mock_connect(db_name):
-            if db_name == "projects.db":
-                return sqlite3.connect(self.test_db.name)
-            return original_connect(db_name)
-        
-        DAL.sqlite3.connect = mock_connect
-        return original_connect
-    
-    def test_index_route(self):
+    def test_index_route(self, client):
         """Test the index route returns correct response."""
-        response = self.client.get('/')
+        response = client.get('/')
         assert response.status_code == 200
         assert b'<!DOCTYPE html>' in response.data or b'<html' in response.data
     
-    def test_index_route_alias(self):
+    def test_index_route_alias(self, client):
         """Test the /index route alias works correctly."""
-        response = self.client.get('/index')
+        response = client.get('/index')
         assert response.status_code == 200
         assert b'<!DOCTYPE html>' in response.data or b'<html' in response.data
     
-    def test_about_route(self):
+    def test_about_route(self, client):
         """Test the about route returns correct response."""
-        response = self.client.get('/about')
+        response = client.get('/about')
         assert response.status_code == 200
         assert b'<!DOCTYPE html>' in response.data or b'<html' in response.data
     
-    def test_resume_route(self):
+    def test_resume_route(self, client):
         """Test the resume route returns correct response."""
-        response = self.client.get('/resume')
+        response = client.get('/resume')
         assert response.status_code == 200
         assert b'<!DOCTYPE html>' in response.data or b'<html' in response.data
     
-    def test_projects_route_get(self):
+    def test_projects_route_get(self, client, mock_database_connection):
         """Test the projects route returns projects data."""
-        response = self.client.get('/projects')
+        response = client.get('/projects')
         assert response.status_code == 200
         assert b'<!DOCTYPE html>' in response.data or b'<html' in response.data
         
@@ -121,9 +69,57 @@ class TestFlaskApp:
         # The exact content depends on your template, but we can check for basic HTML structure
         assert '<html' in response_text.lower() or '<!doctype' in response_text.lower()
     
-    def test_contact_route_get(self):
+    def test_projects_route_pagination_args(self, client, mock_database_connection):
+        """Test that the projects route accepts and clamps limit/offset query args."""
+        for query in ['?limit=1', '?limit=1&offset=1', '?limit=-5&offset=-5', '?limit=abc', '?limit=1000']:
+            response = client.get('/projects' + query)
+            assert response.status_code == 200
+        
+        response = client.get('/projects?limit=1')
+        assert b'Test Project 2' in response.data
+        assert b'Test Project 1' not in response.data
+    
+    def test_static_pages_cache_headers(self, client):
+        """Test that static pages send Cache-Control and answer revalidation with 304."""
+        for route in ['/', '/about', '/resume', '/thankyou']:
+            response = client.get(route)
+            assert response.status_code == 200
+            assert response.cache_control.public
+            assert response.cache_control.max_age == 3600
+
+            etag = response.headers['ETag']
+            response = client.get(route, headers={'If-None-Match': etag})
+            assert response.status_code == 304
+            assert response.data == b''
+
+    def test_projects_etag_changes_after_post(self, client, mock_database_connection, monkeypatch):
+        """Test that the projects page is revalidated on every use and its ETag changes when a project is added."""
+        response = client.get('/projects')
+        assert response.status_code == 200
+        assert response.cache_control.no_cache
+        assert response.cache_control.max_age is None
+        etag = response.headers['ETag']
+
+        # A matching revalidation is answered without rendering the page
+        with monkeypatch.context() as m:
+            m.setattr("app.render_template", None)
+            response = client.get('/projects', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+
+        client.post('/contact', data={
+            'title': 'Cache Busting Project',
+            'description': 'Changes the project list',
+            'image_filename': 'cache.png'
+        })
+
+        response = client.get('/projects', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+        assert b'Cache Busting Project' in response.data
+
+    def test_contact_route_get(self, client, mock_database_connection):
         """Test the contact route GET method returns form."""
-        response = self.client.get('/contact')
+        response = client.get('/contact')
         assert response.status_code == 200
         assert b'<!DOCTYPE html>' in response.data or b'<html' in response.data
         
@@ -131,7 +127,7 @@ class TestFlaskApp:
         response_text = response.data.decode('utf-8')
         assert '<html' in response_text.lower() or '<!doctype' in response_text.lower()
     
-    def test_contact_route_post_valid_data(self):
+    def test_contact_route_post_valid_data(self, client, mock_database_connection):
         """Test the contact route POST method with valid data."""
         form_data = {
             'title': 'New Test Project',
@@ -142,19 +138,18 @@ class TestFlaskApp:
             'demo_link': 'https://demo.test/new-project'
         }
         
-        response = self.client.post('/contact', data=form_data)
+        response = client.post('/contact', data=form_data)
         assert response.status_code == 200
         
         # Verify project was added to database
-        conn = sqlite3.connect(self.test_db.name)
-        cur = conn.cursor()
-        cur.execute("SELECT * FROM projects WHERE Title = ?", (form_data['title'],))
-        result = cur.fetchone()
-        assert result is not None
-        assert result[1] == form_data['title']
-        conn.close()
+        with closing(sqlite3.connect(self.test_db, uri=True)) as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT * FROM projects WHERE Title = ?", (form_data['title'],))
+            result = cur.fetchone()
+            assert result is not None
+            assert result[1] == form_data['title']
     
-    def test_contact_route_post_minimal_data(self):
+    def test_contact_route_post_minimal_data(self, client, mock_database_connection):
         """Test the contact route POST method with minimal required data."""
         form_data = {
             'title': 'Minimal Project',
@@ -165,19 +160,18 @@ class TestFlaskApp:
             'demo_link': ''
         }
         
-        response = self.client.post('/contact', data=form_data)
+        response = client.post('/contact', data=form_data)
         assert response.status_code == 200
         
         # Verify project was added to database
-        conn = sqlite3.connect(self.test_db.name)
-        cur = conn.cursor()
-        cur.execute("SELECT * FROM projects WHERE Title = ?", (form_data['title'],))
-        result = cur.fetchone()
-        assert result is not None
-        assert result[1] == form_data['title']
-        conn.close()
+        with closing(sqlite3.connect(self.test_db, uri=True)) as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT * FROM projects WHERE Title = ?", (form_data['title'],))
+            result = cur.fetchone()
+            assert result is not None
+            assert result[1] == form_data['title']
     
-    def test_contact_route_post_missing_required_fields(self):
+    def test_contact_route_post_missing_required_fields(self, client, mock_database_connection):
         """Test the contact route POST method with missing required fields."""
         form_data = {
             'title': '',  # Missing required field
@@ -185,24 +179,59 @@ class TestFlaskApp:
             'image_filename': 'test.png'
         }
         
-        response = self.client.post('/contact', data=form_data)
+        response = client.post('/contact', data=form_data)
         # Should still return 200 but may show error message
         assert response.status_code == 200
     
-    def test_thankyou_route(self):
+    def test_contact_route_post_failed_save(self, client, mock_database_connection, monkeypatch):
+        """Test that the contact route doesn't claim success when the project could not be saved."""
+        def failing_save(*args, **kwargs):
+            raise sqlite3.OperationalError("database is locked")
+        monkeypatch.setattr("app.saveProjectDB", failing_save)
+        
+        response = client.post('/contact', data={
+            'title': 'Lost Project',
+            'description': 'Never reaches the database',
+            'image_filename': 'lost.png'
+        })
+        assert response.status_code == 200
+        assert b'Something went wrong.' in response.data
+        assert b'Project added successfully!' not in response.data
+        assert b'Lost Project' not in response.data
+    
+    def test_contact_route_post_keeps_page(self, client, mock_database_connection, monkeypatch):
+        """Test that submitting the form from a paged view re-reads the same page."""
+        response = client.get('/contact?limit=1&offset=1')
+        assert b'action="/contact?limit=1&amp;offset=1"' in response.data
+        
+        pages = []
+        def recording_get_all_projects(*args):
+            pages.append(args)
+            return getAllProjects(*args)
+        monkeypatch.setattr("app.getAllProjects", recording_get_all_projects)
+        
+        response = client.post('/contact?limit=1&offset=1', data={
+            'title': 'Paged Project',
+            'description': 'Added from the second page',
+            'image_filename': 'paged.png'
+        })
+        assert response.status_code == 200
+        assert pages == [(1, 1)]
+    
+    def test_thankyou_route(self, client):
         """Test the thankyou route returns correct response."""
-        response = self.client.get('/thankyou')
+        response = client.get('/thankyou')
         assert response.status_code == 200
         assert b'<!DOCTYPE html>' in response.data or b'<html' in response.data
     
-    def test_nonexistent_route(self):
+    def test_nonexistent_route(self, client):
         """Test that nonexistent routes return 404."""
-        response = self.client.get('/nonexistent')
+        response = client.get('/nonexistent')
         assert response.status_code == 404
     
-    def test_projects_data_in_response(self):
+    def test_projects_data_in_response(self, client, mock_database_connection):
         """Test that projects data is properly passed to templates."""
-        response = self.client.get('/projects')
+        response = client.get('/projects')
         assert response.status_code == 200
         
         # This test assumes your template displays project titles
@@ -211,9 +240,9 @@ class TestFlaskApp:
         # Basic check that we get a valid HTML response
         assert '<html' in response_text.lower() or '<!doctype' in response_text.lower()
     
-    def test_contact_data_in_response(self):
+    def test_contact_data_in_response(self, client, mock_database_connection):
         """Test that projects data is properly passed to contact template."""
-        response = self.client.get('/contact')
+        response = client.get('/contact')
         assert response.status_code == 200
         
         # This test assumes your contact template displays current projects
@@ -221,47 +250,46 @@ class TestFlaskApp:
         # Basic check that we get a valid HTML response
         assert '<html' in response_text.lower() or '<!doctype' in response_text.lower()
     
-    def test_http_methods(self):
+    def test_http_methods(self, client):
         """Test that routes only accept allowed HTTP methods."""
         # Test that POST is not allowed on most routes
         routes_to_test = ['/', '/index', '/about', '/resume', '/projects', '/thankyou']
         
         for route in routes_to_test:
-            response = self.client.post(route)
+            response = client.post(route)
             # Should return 405 Method Not Allowed or handle gracefully
             assert response.status_code in [200, 405]
     
-    def test_contact_route_put_method(self):
+    def test_contact_route_put_method(self, client):
         """Test that PUT method is not allowed on contact route."""
-        response = self.client.put('/contact')
+        response = client.put('/contact')
         assert response.status_code == 405  # Method Not Allowed
     
-    def test_contact_route_delete_method(self):
+    def test_contact_route_delete_method(self, client):
         """Test that DELETE method is not allowed on contact route."""
-        response = self.client.delete('/contact')
+        response = client.delete('/contact')
         assert response.status_code == 405  # Method Not Allowed
     
-    def test_response_content_type(self):
+    def test_response_content_type(self, client, mock_database_connection):
         """Test that all routes return HTML content type."""
         routes_to_test = ['/', '/about', '/resume', '/projects', '/contact', '/thankyou']
         
         for route in routes_to_test:
-            response = self.client.get(route)
+            response = client.get(route)
             assert response.status_code == 200
             # Check that content type is HTML
             assert 'text/html' in response.content_type
     
-    def test_database_initialization(self):
+    def test_database_initialization(self, client, mock_database_connection):
         """Test that database is properly initialized."""
         # This test verifies that createDatabase function works
         # We'll test it by checking if we can retrieve projects
-        response = self.client.get('/projects')
+        response = client.get('/projects')
         assert response.status_code == 200
         
         # Verify that projects are being retrieved from our test database
-        conn = sqlite3.connect(self.test_db.name)
-        cur = conn.cursor()
-        cur.execute("SELECT COUNT(*) FROM projects")
-        count = cur.fetchone()[0]
-        assert count > 0  # Should have our test data
-        conn.close()
+        with closing(sqlite3.connect(self.test_db, uri=True)) as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT COUNT(*) FROM projects")
+            count = cur.fetchone()[0]
+            assert count > 0  # Should have our test data
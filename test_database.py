@@ -5,233 +5,225 @@ Tests database connection, CRUD operations, and data integrity.
 
 import pytest
 import sqlite3
-import os
-import tempfile
+from contextlib import closing
+import DAL
 from DAL import createDatabase, saveProjectDB, getAllProjects
 
 
+# Inserts a full six-column project row; used by test_get_all_projects with executemany
+_INSERT_SQL = """
+    INSERT INTO projects (Title, Description, ImageFileName, Technologies, GitHubLink, DemoLink)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+# Rows loaded by test_get_all_projects
+_SAMPLE_PROJECTS = (
+    ("Project 1", "Description 1", "image1.png", "Tech 1", "github1", "demo1"),
+    ("Project 2", "Description 2", "image2.png", "Tech 2", "github2", "demo2"),
+    ("Project 3", "Description 3", "", "Tech 3", "github3", "demo3"),  # Empty image
+)
+
+# saveProjectDB arguments for test_save_project_to_database; omitted
+# optional fields should be stored as empty strings
+_SAVE_CASES = [
+    pytest.param(("Test Project", "This is a test project", "test.png",
+                  "Python, Flask", "https://github.com/test", "https://demo.test"), id="all_fields"),
+    pytest.param(("Minimal Project", "Only the required fields", "minimal.png", "", "", ""), id="minimal"),
+    pytest.param(("Default Project", "Optional fields left to their defaults", "default.png"), id="defaults"),
+    pytest.param(("Projet café ☕", "Описание и 説明", "émoji_🚀.png",
+                  "Python, Flask", "https://github.com/tëst", "https://demo.test/ü"), id="unicode"),
+    pytest.param(("T" * 1000, "D" * 100000, "i" * 255 + ".png",
+                  "Python, " * 500, "https://github.com/" + "a" * 2000, "https://demo.test/" + "b" * 2000), id="long_strings"),
+]
+
+
 class TestDatabase:
     """Test class for database operations."""
     
     @pytest.fixture(autouse=True)
-    def setup_and_teardown(self):
-        """Setup and teardown for each test."""
-        # Create a temporary database for testing
-        self.test_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
-        self.test_db.close()
-        
-        # Store original database name and replace with test database
-        self.original_db = "projects.db"
-        
-        # Create test database
-        self.create_test_database()
-        
-        yield
-        
-        # Cleanup: remove test database file
-        if os.path.exists(self.test_db.name):
-            os.unlink(self.test_db.name)
-    
-    def create_test_database(self):
-        """Create a test database with the same structure as the main database."""
-        conn = sqlite3.connect(self.test_db.name)
-        cur = conn.cursor()
-        
-        # Create the projects table
-        cur.execute('''
-            CREATE TABLE IF NOT EXISTS projects (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                Title TEXT NOT NULL,
-                Description TEXT NOT NULL,
-                ImageFileName TEXT NOT NULL,
-                Technologies TEXT,
-                GitHubLink TEXT,
-                DemoLink TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+    def setup_database(self, test_database, empty_database, mock_database_connection):
+        """Give each test an empty test database with the DAL pointed at it."""
+        self.test_db_uri = test_database
+        self.conn = empty_database
     
     def test_database_connection(self):
         """Test that we can connect to the database."""
-        conn = sqlite3.connect(self.test_db.name)
-        assert conn is not None
-        conn.close()
+        with closing(sqlite3.connect(self.test_db_uri, uri=True)) as conn:
+            assert conn is not None
     
     def test_database_table_exists(self):
         """Test that the projects table exists and has correct structure."""
-        conn = sqlite3.connect(self.test_db.name)
-        cur = conn.cursor()
+        # Selecting no rows still fails if the table is missing and describes its columns
+        cur = self.conn.execute("SELECT * FROM projects WHERE 0")
+        column_names = {col[0] for col in cur.description}
         
-        # Check if table exists
-        cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='projects'")
-        result = cur.fetchone()
-        assert result is not None
-        assert result[0] == 'projects'
-        
-        # Check table structure
-        cur.execute("PRAGMA table_info(projects)")
-        columns = cur.fetchall()
-        column_names = [col[1] for col in columns]
-        
-        expected_columns = ['id', 'Title', 'Description', 'ImageFileName', 'Technologies', 'GitHubLink', 'DemoLink', 'created_at']
-        for expected_col in expected_columns:
-            assert expected_col in column_names
-        
-        conn.close()
+        expected_columns = {'id', 'Title', 'Description', 'ImageFileName', 'Technologies', 'GitHubLink', 'DemoLink', 'created_at'}
+        missing = expected_columns - column_names
+        assert not missing, "missing columns: %s" % sorted(missing)
     
-    def test_save_project_to_database(self):
+    @pytest.mark.parametrize("project", _SAVE_CASES)
+    def test_save_project_to_database(self, project):
         """Test saving a project to the database."""
-        # Mock the database connection by temporarily replacing the database name
-        import DAL
-        original_db = DAL.sqlite3.connect
-        
-        def mock_connect(db_name):
-            if db_name == "projects.db":
-                return sqlite3.connect(self.test_db.name)
-            return original_db(db_name)
+        # Save project
+        saveProjectDB(*project)
         
-        DAL.sqlite3.connect = mock_connect
+        # Verify project was saved
+        cur = self.conn.cursor()
+        cur.execute("SELECT * FROM projects WHERE Title = ?", (project[0],))
+        result = cur.fetchone()
         
-        try:
-            # Test data
-            title = "Test Project"
-            description = "This is a test project"
-            image_filename = "test.png"
-            technologies = "Python, Flask"
-            github_link = "https://github.com/test"
-            demo_link = "https://demo.test"
-            
-            # Save project
-            saveProjectDB(title, description, image_filename, technologies, github_link, demo_link)
-            
-            # Verify project was saved
-            conn = sqlite3.connect(self.test_db.name)
-            cur = conn.cursor()
-            cur.execute("SELECT * FROM projects WHERE Title = ?", (title,))
-            result = cur.fetchone()
-            
-            assert result is not None
-            assert result[1] == title
-            assert result[2] == description
-            assert result[3] == image_filename
-            assert result[4] == technologies
-            assert result[5] == github_link
-            assert result[6] == demo_link
-            
-            conn.close()
-        finally:
-            # Restore original connect function
-            DAL.sqlite3.connect = original_db
+        assert result is not None
+        assert result[1:7] == project + ("",) * (6 - len(project))
     
     def test_get_all_projects(self):
         """Test retrieving all projects from the database."""
         # Insert test data
-        conn = sqlite3.connect(self.test_db.name)
-        cur = conn.cursor()
-        
-        test_projects = [
-            ("Project 1", "Description 1", "image1.png", "Tech 1", "github1", "demo1"),
-            ("Project 2", "Description 2", "image2.png", "Tech 2", "github2", "demo2"),
-            ("Project 3", "Description 3", "", "Tech 3", "github3", "demo3")  # Empty image
-        ]
-        
-        for project in test_projects:
-            cur.execute('''
-                INSERT INTO projects (Title, Description, ImageFileName, Technologies, GitHubLink, DemoLink)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', project)
-        
-        conn.commit()
-        conn.close()
-        
-        # Mock the database connection
-        import DAL
-        original_db = DAL.sqlite3.connect
-        
-        def mock_connect(db_name):
-            if db_name == "projects.db":
-                return sqlite3.connect(self.test_db.name)
-            return original_db(db_name)
+        with self.conn:
+            self.conn.executemany(_INSERT_SQL, _SAMPLE_PROJECTS)
+        
+        # Get all projects, keyed by title (ordering is covered by test_get_all_projects_paginates)
+        projects = getAllProjects()
+        by_title = {p["Title"]: p for p in projects}
+        
+        # Verify results
+        assert len(projects) == 3
+        assert set(by_title) == {"Project 1", "Project 2", "Project 3"}
+        
+        # Test placeholder image for empty image filename
+        assert by_title["Project 3"]["Image"] == "placeholder.png"
+        assert by_title["Project 1"]["Image"] == "image1.png"
+        
+        # Verify all required fields are present
+        for project in projects:
+            assert "Title" in project
+            assert "Description" in project
+            assert "Image" in project
+            assert "Technologies" in project
+            assert "GitHubLink" in project
+            assert "DemoLink" in project
+
+    def test_save_project_updates_cached_list(self):
+        """Test that saving adds to the cached project list without re-reading the table."""
+        saveProjectDB("Project 1", "Description 1", "image1.png")
+        assert len(getAllProjects()) == 1
+
+        # A row written behind the DAL's back is not seen while cached
+        with self.conn:
+            self.conn.execute('''
+                INSERT INTO projects (Title, Description, ImageFileName)
+                VALUES (?, ?, ?)
+            ''', ("Project 2", "Description 2", "image2.png"))
+        assert len(getAllProjects()) == 1
+
+        # Saving through the DAL adds the new project to the cached list
+        saveProjectDB("Project 3", "Description 3", "image3.png")
+        assert [p["Title"] for p in getAllProjects()] == ["Project 3", "Project 1"]
+
+        # Dropping the cache reads every row again
+        DAL.closeConnection()
+        assert len(getAllProjects()) == 3
+
+    def test_failed_save_raises(self):
+        """Test that saveProjectDB reports a row the database rejects instead of dropping it silently."""
+        saveProjectDB("Good Project", "Description", "image1.png")
+        assert [p["Title"] for p in getAllProjects()] == ["Good Project"]
         
-        DAL.sqlite3.connect = mock_connect
+        with pytest.raises(sqlite3.IntegrityError):
+            saveProjectDB("Bad Project", None, "image2.png")
         
-        try:
-            # Get all projects
-            projects = getAllProjects()
-            
-            # Verify results
-            assert len(projects) == 3
-            assert projects[0]["Title"] == "Project 1"
-            assert projects[1]["Title"] == "Project 2"
-            assert projects[2]["Title"] == "Project 3"
-            
-            # Test placeholder image for empty image filename
-            assert projects[2]["Image"] == "placeholder.png"
-            
-            # Verify all required fields are present
-            for project in projects:
-                assert "Title" in project
-                assert "Description" in project
-                assert "Image" in project
-                assert "Technologies" in project
-                assert "GitHubLink" in project
-                assert "DemoLink" in project
-                
-        finally:
-            # Restore original connect function
-            DAL.sqlite3.connect = original_db
+        # Neither the table nor the cache shows the rejected project
+        cur = self.conn.cursor()
+        cur.execute("SELECT Title FROM projects")
+        assert cur.fetchall() == [("Good Project",)]
+        assert [p["Title"] for p in getAllProjects()] == ["Good Project"]
     
-    def test_database_integrity(self):
-        """Test database integrity constraints."""
-        conn = sqlite3.connect(self.test_db.name)
-        cur = conn.cursor()
-        
-        # Test that required fields cannot be NULL
-        with pytest.raises(sqlite3.IntegrityError):
-            cur.execute('''
+    def test_get_all_projects_paginates(self):
+        """Test that limit and offset page through projects newest first."""
+        with self.conn:
+            self.conn.executemany('''
                 INSERT INTO projects (Title, Description, ImageFileName)
                 VALUES (?, ?, ?)
-            ''', (None, "Description", "image.png"))
+            ''', [("Project %d" % i, "Description %d" % i, "image%d.png" % i) for i in range(1, 6)])
         
-        with pytest.raises(sqlite3.IntegrityError):
-            cur.execute('''
+        first_page = getAllProjects(limit=2)
+        second_page = getAllProjects(limit=2, offset=2)
+        last_page = getAllProjects(limit=2, offset=4)
+        
+        assert [p["Title"] for p in first_page] == ["Project 5", "Project 4"]
+        assert [p["Title"] for p in second_page] == ["Project 3", "Project 2"]
+        assert [p["Title"] for p in last_page] == ["Project 1"]
+        
+        # A new project shows up at the top of the first page
+        saveProjectDB("Project 6", "Description 6", "image6.png")
+        assert [p["Title"] for p in getAllProjects(limit=2)] == ["Project 6", "Project 5"]
+    
+    def test_create_database_seeds_only_once(self):
+        """Test that sample projects are inserted on first setup only."""
+        createDatabase()
+        createDatabase()
+
+        cur = self.conn.cursor()
+        cur.execute("SELECT COUNT(*) FROM projects")
+        assert cur.fetchone()[0] == 2
+        cur.execute("PRAGMA user_version")
+        assert cur.fetchone()[0] == 1
+
+        # Once seeded, an emptied table is left empty
+        with self.conn:
+            self.conn.execute("DELETE FROM projects")
+        createDatabase()
+        cur.execute("SELECT COUNT(*) FROM projects")
+        assert cur.fetchone()[0] == 0
+
+    def test_create_database_keeps_existing_projects(self):
+        """Test that a database with projects but no user_version is not seeded."""
+        with self.conn:
+            self.conn.execute('''
                 INSERT INTO projects (Title, Description, ImageFileName)
                 VALUES (?, ?, ?)
-            ''', ("Title", None, "image.png"))
-        
-        with pytest.raises(sqlite3.IntegrityError):
-            cur.execute('''
+            ''', ("Existing Project", "Description", "image.png"))
+
+        createDatabase()
+
+        cur = self.conn.cursor()
+        cur.execute("SELECT Title FROM projects")
+        assert cur.fetchall() == [("Existing Project",)]
+        cur.execute("PRAGMA user_version")
+        assert cur.fetchone()[0] == 1
+
+    @pytest.mark.parametrize("bad_row", [
+        (None, "Description", "image.png"),
+        ("Title", None, "image.png"),
+        ("Title", "Description", None),
+    ], ids=["no_title", "no_description", "no_image"])
+    def test_database_integrity(self, bad_row):
+        """Test that required fields cannot be NULL."""
+        # The connection's context manager rolls back the failed insert
+        # before pytest.raises sees the error, so the shared connection stays clean
+        with pytest.raises(sqlite3.IntegrityError), self.conn:
+            self.conn.execute('''
                 INSERT INTO projects (Title, Description, ImageFileName)
                 VALUES (?, ?, ?)
-            ''', ("Title", "Description", None))
-        
-        conn.close()
+            ''', bad_row)
     
     def test_database_auto_increment(self):
         """Test that the ID field auto-increments correctly."""
-        conn = sqlite3.connect(self.test_db.name)
-        cur = conn.cursor()
+        cur = self.conn.cursor()
         
         # Insert two projects
-        cur.execute('''
-            INSERT INTO projects (Title, Description, ImageFileName)
-            VALUES (?, ?, ?)
-        ''', ("Project 1", "Description 1", "image1.png"))
-        
-        cur.execute('''
-            INSERT INTO projects (Title, Description, ImageFileName)
-            VALUES (?, ?, ?)
-        ''', ("Project 2", "Description 2", "image2.png"))
-        
-        conn.commit()
+        with self.conn:
+            cur.execute('''
+                INSERT INTO projects (Title, Description, ImageFileName)
+                VALUES (?, ?, ?)
+            ''', ("Project 1", "Description 1", "image1.png"))
+            
+            cur.execute('''
+                INSERT INTO projects (Title, Description, ImageFileName)
+                VALUES (?, ?, ?)
+            ''', ("Project 2", "Description 2", "image2.png"))
         
         # Check IDs
         cur.execute("SELECT id FROM projects ORDER BY id")
         ids = [row[0] for row in cur.fetchall()]
         
         assert ids == [1, 2]
-        
-        conn.close()